@@ -27,6 +27,10 @@ CORS(app)
 def get_database_uri():
     database_url = os.environ.get("DATABASE_URL")
     
+    # Explicit SQLite URL (e.g. benchmarks ke liye alag file) seedha use karo
+    if database_url and database_url.startswith("sqlite:"):
+        return database_url
+    
     if database_url:
         # Fix postgres:// to postgresql:// for SQLAlchemy 2.0+
         if database_url.startswith("postgres://"):
@@ -78,6 +82,8 @@ with app.app_context():
     
     # Create all tables
     db.create_all()
+    models.upgrade_predictions_table()
+    models.sync_symbols()
     
     # Initialize ML model
     from ml_model import CryptoPredictionModel
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk portfolio import/export
+Kabhi app ka asli database use nahi karta:
+  - SQLite (default): ek temporary file, benchmark ke baad delete
+  - PostgreSQL: --database-url se ek alag scratch database do
+
+Usage:
+  python benchmark_portfolio.py --rows 100000
+  python benchmark_portfolio.py --rows 100000 --database-url postgresql://user@localhost/bench_scratch
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from symbols import registry
+
+BENCHMARK_NOTE = 'benchmark-import'
+
+def build_csv(rows):
+    """Synthetic exchange trade history banata hai"""
+    symbols = registry.symbols()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['crypto', 'amount', 'purchase_price', 'purchase_date', 'notes'])
+    for _ in range(rows):
+        writer.writerow([
+            random.choice(symbols),
+            round(random.uniform(0.001, 10), 6),
+            round(random.uniform(1, 70000), 2),
+            f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            BENCHMARK_NOTE
+        ])
+    return buffer.getvalue().encode('utf-8')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--database-url', help='Scratch PostgreSQL database (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    # app import hone se pehle DATABASE_URL set karo, taaki asli database chhua hi na jaaye
+    scratch_dir = None
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        scratch_dir = tempfile.mkdtemp(prefix='portfolio_bench_')
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(scratch_dir, 'bench.db')}"
+
+    logging.basicConfig(level=logging.WARNING)
+    from app import app, db
+    from models import PortfolioHolding
+
+    payload = build_csv(args.rows)
+    client = app.test_client()
+    with app.app_context():
+        print(f"Database: {db.engine.dialect.name}")
+        if args.database_url and args.database_url.startswith('postgres') and db.engine.dialect.name != 'postgresql':
+            print("PostgreSQL not reachable, refusing to fall back to the app database")
+            return
+        # Sirf isi run ki rows delete karni hain, isliye pehle ka max id yaad rakho
+        start_id = db.session.execute(db.select(db.func.max(PortfolioHolding.id))).scalar() or 0
+
+    try:
+        start = time.perf_counter()
+        response = client.post('/api/portfolio/import', data=payload, content_type='text/csv')
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            print(f"Import failed: {response.get_json()}")
+            return
+        print(f"Import: {args.rows} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+        start = time.perf_counter()
+        response = client.get('/api/portfolio/export')
+        exported = response.get_data().count(b'\n') - 1
+        elapsed = time.perf_counter() - start
+        print(f"Export: {exported} rows in {elapsed:.2f}s ({exported / elapsed:,.0f} rows/s)")
+    finally:
+        with app.app_context():
+            db.session.execute(db.delete(PortfolioHolding).where(
+                PortfolioHolding.id > start_id, PortfolioHolding.notes == BENCHMARK_NOTE))
+            db.session.commit()
+            db.engine.dispose()
+        if scratch_dir:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
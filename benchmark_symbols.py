@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for a large symbol universe
+Kuch sau synthetic symbols ka registry, local price fixture (CSV) aur chhote
+LSTM models banakar dikhata hai ki validation O(1) hai aur on-demand model
+loading ke saath memory/latency universe badhne par flat rehte hain.
+
+Usage: python benchmark_symbols.py --symbols 300 --max-loaded 16
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import resource
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from symbols import registry
+
+def peak_rss_mb():
+    # Linux par ru_maxrss KB mein hota hai
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def build_fixture(path, symbols, days=400, seed=0):
+    """Random-walk prices ka local dataset (tune_model.py wala format: Date + ek column per symbol)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.03, size=(days, len(symbols)))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq='D')
+    pd.DataFrame(prices, index=index, columns=symbols).to_csv(path)
+
+def build_artifacts(workdir, fixture, symbols, lookback_days):
+    """Har symbol ke liye model + scaler files (ek hi chhota model copy hota hai, yeh sirf load test hai)"""
+    from ml_model import build_lstm_model
+
+    model_dir = os.path.join(workdir, 'models')
+    scaler_dir = os.path.join(workdir, 'scalers')
+    os.makedirs(model_dir)
+    os.makedirs(scaler_dir)
+
+    template = os.path.join(workdir, 'template.keras')
+    build_lstm_model({'units': 8, 'layers': 1, 'dropout': 0.0, 'lookback_days': lookback_days}).save(template)
+
+    for symbol in symbols:
+        shutil.copy(template, os.path.join(model_dir, f"model_{symbol.lower()}.keras"))
+        scaler = MinMaxScaler(feature_range=(0, 1)).fit(fixture[symbol].values.reshape(-1, 1))
+        with open(os.path.join(scaler_dir, f"scaler_{symbol.lower()}.pkl"), 'wb') as f:
+            pickle.dump(scaler, f)
+
+    return model_dir, scaler_dir
+
+def time_validation(symbols, lookups=200000):
+    """Registry mein `lookups` membership checks ka time (ns per lookup)"""
+    probes = [symbols[i % len(symbols)] for i in range(lookups)]
+    start = time.perf_counter()
+    for s in probes:
+        s in registry
+    return (time.perf_counter() - start) / lookups * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--max-loaded', type=int, default=16, help='Memory mein max models (LRU)')
+    parser.add_argument('--lookback', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    from ml_model import CryptoPredictionModel
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    workdir = tempfile.mkdtemp(prefix='symbol_bench_')
+
+    try:
+        # Registry: chhote aur bade universe mein validation ka time
+        registry.load({'symbol': s, 'tier': 1 if i < 20 else 2} for i, s in enumerate(symbols[:10]))
+        small_ns = time_validation(symbols[:10])
+        registry.load({'symbol': s, 'tier': 1 if i < 20 else 2} for i, s in enumerate(symbols))
+        large_ns = time_validation(symbols)
+        print(f"Validation: {small_ns:.0f} ns/lookup with 10 symbols, {large_ns:.0f} ns/lookup with {len(symbols)} symbols")
+        print(f"Tiers: {len(registry.symbols(1))} tier-1, {len(registry.symbols(2))} tier-2")
+
+        fixture_path = os.path.join(workdir, 'prices.csv')
+        build_fixture(fixture_path, symbols)
+        fixture = pd.read_csv(fixture_path, index_col=0, parse_dates=True)
+
+        start = time.perf_counter()
+        model_dir, scaler_dir = build_artifacts(workdir, fixture, symbols, args.lookback)
+        print(f"Built {len(symbols)} model artifacts in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        predictor = CryptoPredictionModel(model_dir, scaler_dir, max_loaded_models=args.max_loaded)
+        print(f"Startup: {(time.perf_counter() - start) * 1000:.1f} ms (no models loaded)")
+
+        # Poore universe par predict karo; har 50 symbols par memory aur latency dekho
+        latencies = []
+        for i, symbol in enumerate(symbols, start=1):
+            data = fixture[[symbol]].rename(columns={symbol: 'Close'})
+            start = time.perf_counter()
+            result = predictor.predict_price(symbol, data=data)
+            latencies.append(time.perf_counter() - start)
+            if result is None:
+                print(f"Prediction failed for {symbol}")
+            if i % 50 == 0 or i == len(symbols):
+                recent = np.array(latencies[-50:]) * 1000
+                print(f"  {i:4d} symbols: {len(predictor.models)} models in memory, "
+                      f"peak RSS {peak_rss_mb():.0f} MB, p50 {np.median(recent):.1f} ms (cold load + predict)")
+
+        # Cache mein pade models par dobara predict (warm path)
+        warm = []
+        for symbol in list(predictor.models):
+            data = fixture[[symbol]].rename(columns={symbol: 'Close'})
+            start = time.perf_counter()
+            predictor.predict_price(symbol, data=data)
+            warm.append(time.perf_counter() - start)
+        print(f"Warm predictions: p50 {np.median(warm) * 1000:.1f} ms over {len(warm)} cached models")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -3,35 +3,194 @@ import pandas as pd
 import yfinance as yf
 import pickle
 import os
+import json
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+from symbols import registry
+
 # NAYE IMPORTS (Phase 2 ke liye)
 from sklearn.preprocessing import MinMaxScaler # Data ko 0-1 scale karne ke liye
 from tensorflow.keras.models import Sequential, load_model # Naya model banane aur load karne ke liye
 from tensorflow.keras.layers import LSTM, Dense, Dropout # Model ki layers
 
+# Default LSTM architecture (jab manifest mein symbol ka tuned config na ho)
+DEFAULT_MODEL_CONFIG = {
+    'units': 50,
+    'layers': 3,
+    'dropout': 0.2,
+    'lookback_days': 60,
+    'batch_size': 32,
+    'epochs': 25
+}
+
+# tune_model.py har symbol ka best config yahaan likhta hai
+MANIFEST_PATH = 'models/manifest.json'
+
+# Ek saath memory mein kitne models rahenge (baaki disk se on-demand load hote hain)
+MAX_LOADED_MODELS = int(os.environ.get('MAX_LOADED_MODELS', 32))
+
+# Batch prediction mein ek Yahoo Finance download mein kitne tickers
+DOWNLOAD_BATCH_SIZE = 50
+
+def load_manifest(path=MANIFEST_PATH):
+    """Artifact manifest padho ({symbol: config}); file na ho toh khaali dict"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.error(f"Could not read model manifest {path}: {e}")
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Manifest ko atomically likho taaki aadhi likhi file kabhi load na ho"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def get_model_config(symbol, manifest=None):
+    """Default config ke upar manifest ka tuned config lagao"""
+    if manifest is None:
+        manifest = load_manifest()
+    config = dict(DEFAULT_MODEL_CONFIG)
+    config.update({k: v for k, v in manifest.get(symbol, {}).items() if k in DEFAULT_MODEL_CONFIG})
+    return config
+
+def build_lstm_model(config):
+    """
+    Stacked LSTM ka architecture `config` ke hisaab se banata hai
+    (units, layers, dropout, lookback_days).
+    """
+    model = Sequential()
+    layers = config['layers']
+    
+    for i in range(layers):
+        # Aakhri LSTM layer ke alawa sab return_sequences=True rakhte hain
+        # taaki data agli LSTM layer tak jaaye
+        kwargs = {'input_shape': (config['lookback_days'], 1)} if i == 0 else {}
+        model.add(LSTM(units=config['units'], return_sequences=i < layers - 1, **kwargs))
+        model.add(Dropout(config['dropout'])) # Kuch neurons 'band' kardo (overfitting rokne ke liye)
+    
+    # Final Output Layer: 1 number (agle din ka price)
+    model.add(Dense(units=1))
+    
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+def prepare_features(scaled_data, lookback_days):
+    """Data ko `lookback_days` lambe 3D "chunks" (tukdon) mein todta hai"""
+    X, y = [], []
+    
+    # lookback_days ka data (X) lo, aur agle din ka data (y) predict karo
+    for i in range(lookback_days, len(scaled_data)):
+        X.append(scaled_data[i-lookback_days:i, 0])
+        y.append(scaled_data[i, 0])
+        
+    return np.array(X), np.array(y)
+
 class CryptoPredictionModel:
-    def __init__(self):
-        self.models = {} # Trained models (dimag) yahaan store honge
+    def __init__(self, model_dir='models', scaler_dir='scalers', max_loaded_models=MAX_LOADED_MODELS):
+        # Trained models (dimag) yahaan store honge. OrderedDict LRU cache ki tarah kaam karta hai:
+        # sabse kam use hua model pehle memory se hatta hai
+        self.models = OrderedDict()
         self.scalers = {} # Scalers (0-1 converter) yahaan store honge
-        self.lookback_days = 60 # IMPORTANT: Hum 5 din ki jagah ab 60 din ka data dekhenge
+        self.lookback_days = DEFAULT_MODEL_CONFIG['lookback_days'] # IMPORTANT: Hum 5 din ki jagah ab 60 din ka data dekhenge
+        self.lookbacks = {} # Har symbol ka lookback (tuned models ka alag ho sakta hai)
+        self.model_dir = model_dir
+        self.scaler_dir = scaler_dir
+        self.max_loaded_models = max_loaded_models
+        # Threaded server mein LRU cache ko guard karta hai (sirf lookup, insert aur eviction)
+        self._models_lock = threading.Lock()
+        # {symbol: Lock} jo model abhi disk se load ho rahe hain; ek symbol ek hi baar load hota hai
+        self._load_locks = {}
         
         # models/ folder banao agar nahi hai toh
-        if not os.path.exists('models'):
-            os.makedirs('models')
+        if not os.path.exists(model_dir):
+            os.makedirs(model_dir)
         
         # Scalers ko save karne ke liye folder
-        if not os.path.exists('scalers'):
-            os.makedirs('scalers')
+        if not os.path.exists(scaler_dir):
+            os.makedirs(scaler_dir)
 
-        # App start hote hi, saare models ko load ya train karo
-        self.load_or_train_models()
+        # Models ab startup par load nahi hote; pehli prediction par get_model() load karta hai.
+        # Naye models train_model.py se train hote hain (load_or_train_models)
+    
+    def _artifact_paths(self, symbol):
+        model_path = os.path.join(self.model_dir, f"model_{symbol.lower()}.keras") # .pkl nahi, .keras
+        scaler_path = os.path.join(self.scaler_dir, f"scaler_{symbol.lower()}.pkl")
+        return model_path, scaler_path
+    
+    def has_model(self, symbol):
+        """Symbol ka trained model disk par hai ya nahi (load kiye bina)"""
+        return all(os.path.exists(p) for p in self._artifact_paths(symbol))
+    
+    def _cache_model(self, symbol, model, scaler, lookback_days):
+        """Model ko LRU cache mein rakho, limit se zyada ho toh sabse purana hatao"""
+        with self._models_lock:
+            self.models[symbol] = model
+            self.models.move_to_end(symbol)
+            self.scalers[symbol] = scaler
+            self.lookbacks[symbol] = lookback_days
+            
+            while len(self.models) > self.max_loaded_models:
+                evicted, _ = self.models.popitem(last=False)
+                self.scalers.pop(evicted, None)
+                self.lookbacks.pop(evicted, None)
+                logging.debug(f"Evicted model for {evicted} from memory")
+    
+    def get_model(self, symbol):
+        """(model, scaler, lookback_days) memory se, ya disk se load karke; nahi mila toh None"""
+        artifacts = self._cached_model(symbol)
+        if artifacts is not None:
+            return artifacts
+        
+        # Disk se load global lock ke bahar hota hai, taaki ek symbol ka load baaki
+        # symbols ki cache hits ko na roke; per-symbol lock se ek model do baar load nahi hota
+        with self._models_lock:
+            load_lock = self._load_locks.setdefault(symbol, threading.Lock())
+        
+        with load_lock:
+            try:
+                # Hamare intezaar ke dauraan doosre thread ne load kar diya ho sakta hai
+                artifacts = self._cached_model(symbol)
+                if artifacts is not None:
+                    return artifacts
+                
+                if not self.has_model(symbol):
+                    return None
+                
+                model_path, scaler_path = self._artifact_paths(symbol)
+                model = load_model(model_path) # Keras model aise load hota hai
+                with open(scaler_path, 'rb') as f:
+                    scaler = pickle.load(f)
+                # Lookback model ke input shape se lo, manifest baad mein badla ho sakta hai
+                lookback_days = model.input_shape[1]
+                
+                self._cache_model(symbol, model, scaler, lookback_days)
+                logging.info(f"Loaded existing LSTM model and scaler for {symbol}")
+                return model, scaler, lookback_days
+            finally:
+                with self._models_lock:
+                    if self._load_locks.get(symbol) is load_lock:
+                        del self._load_locks[symbol]
+    
+    def _cached_model(self, symbol):
+        """(model, scaler, lookback_days) agar memory mein hai, warna None"""
+        with self._models_lock:
+            if symbol not in self.models:
+                return None
+            self.models.move_to_end(symbol)
+            return self.models[symbol], self.scalers[symbol], self.lookbacks[symbol]
     
     def get_crypto_data(self, symbol, period="2y"):
         """Yahoo Finance se data fetch karna (Yeh function same hai)"""
         try:
-            ticker = f"{symbol}-USD"
+            ticker = registry.ticker(symbol)
             # auto_adjust=True fixes some pandas warnings
             data = yf.download(ticker, period=period, interval="1d", auto_adjust=True)
             if data is None or data.empty:
@@ -42,48 +201,20 @@ class CryptoPredictionModel:
             logging.error(f"Error fetching data for {symbol}: {e}")
             return None
     
-    def _build_lstm_model(self):
+    def _build_lstm_model(self, config=None):
         """
         YEH NAYA FUNCTION HAI
         Yeh hamara naya "Shahi Biryani" (Stacked LSTM) model ka architecture banata hai.
+        Default: 3 x 50-unit LSTM layers, dropout 0.2 (manifest se override hota hai)
         """
-        model = Sequential()
-        
-        # Layer 1: Pehli LSTM layer (50 units)
-        # return_sequences=True ka matlab hai ki data ko agli layer par bhejo
-        model.add(LSTM(units=50, return_sequences=True, input_shape=(self.lookback_days, 1)))
-        model.add(Dropout(0.2)) # 20% neurons ko 'band' kardo (overfitting rokne ke liye)
-        
-        # Layer 2: Doosri LSTM layer
-        model.add(LSTM(units=50, return_sequences=True))
-        model.add(Dropout(0.2))
-        
-        # Layer 3: Teesri LSTM layer
-        # return_sequences=False ka matlab hai ki ab bas final output do
-        model.add(LSTM(units=50, return_sequences=False))
-        model.add(Dropout(0.2))
-        
-        # Layer 4: Final Output Layer
-        # Dense(1) ka matlab hai ki humein 1 number (agle din ka price) predict karna hai
-        model.add(Dense(units=1))
-        
-        # Model ko compile karo
-        model.compile(optimizer='adam', loss='mean_squared_error')
-        return model
+        return build_lstm_model(config or DEFAULT_MODEL_CONFIG)
 
-    def prepare_features(self, scaled_data):
+    def prepare_features(self, scaled_data, lookback_days=None):
         """
         YEH FUNCTION UPDATE HO GAYA HAI
         Ab yeh data ko 3D "chunks" (tukdon) mein todta hai.
         """
-        X, y = [], []
-        
-        # 60 din ka data (X) lo, aur 61st din ka data (y) predict karo
-        for i in range(self.lookback_days, len(scaled_data)):
-            X.append(scaled_data[i-self.lookback_days:i, 0])
-            y.append(scaled_data[i, 0])
-            
-        return np.array(X), np.array(y)
+        return prepare_features(scaled_data, lookback_days or self.lookback_days)
     
     def train_model(self, symbol):
         """
@@ -92,6 +223,9 @@ class CryptoPredictionModel:
         """
         logging.info(f"Starting NEW LSTM model training for {symbol}...")
         
+        # Tuned config manifest se lo (nahi hai toh default architecture)
+        config = get_model_config(symbol)
+        
         # 1. Data Fetch Karo
         data = self.get_crypto_data(symbol, period="3y") # 3 saal ka data lete hain
         if data is None:
@@ -106,57 +240,48 @@ class CryptoPredictionModel:
         scaled_data = scaler.fit_transform(close_prices)
         
         # 3. Data Ko Reshape Karo (LSTM ke liye)
-        X, y = self.prepare_features(scaled_data)
+        X, y = self.prepare_features(scaled_data, config['lookback_days'])
         if X is None or len(X) == 0:
             logging.error(f"Could not prepare features for {symbol}")
             return False
             
         # Reshape X to 3D: [samples, timesteps, features]
-        # (Number of samples, 60 days, 1 feature (price))
+        # (Number of samples, lookback days, 1 feature (price))
         X = np.reshape(X, (X.shape[0], X.shape[1], 1))
         
         # 4. Model Build Karo
-        model = self._build_lstm_model()
+        model = self._build_lstm_model(config)
         
         # 5. Model Train Karo
         # epochs=25 ka matlab hai ki model data ko 25 baar dekhega
-        logging.info(f"Training LSTM for {symbol}... This will take time.")
-        model.fit(X, y, epochs=25, batch_size=32, verbose=1)
+        logging.info(f"Training LSTM for {symbol} with config {config}... This will take time.")
+        model.fit(X, y, epochs=config['epochs'], batch_size=config['batch_size'], verbose=1)
         
         # 6. Naya Model Aur Scaler Save Karo
-        model_path = f"models/model_{symbol.lower()}.keras" # .pkl nahi, .keras
-        scaler_path = f"scalers/scaler_{symbol.lower()}.pkl"
+        model_path, scaler_path = self._artifact_paths(symbol)
         
         model.save(model_path) # Keras model ko aise save karte hain
         with open(scaler_path, 'wb') as f:
             pickle.dump(scaler, f) # Scaler ko waise hi pickle karte hain
             
         # Inhe memory mein bhi store karo
-        self.models[symbol] = model
-        self.scalers[symbol] = scaler
+        self._cache_model(symbol, model, scaler, config['lookback_days'])
         
         logging.info(f"NEW LSTM Model for {symbol} saved to {model_path}")
         return True
     
-    def load_or_train_models(self):
+    def load_or_train_models(self, symbols=None):
         """
         YEH FUNCTION UPDATE HO GAYA HAI
-        Ab yeh .keras (model) aur .pkl (scaler) files ko dhoondta hai
+        Ab yeh .keras (model) aur .pkl (scaler) files ko dhoondta hai.
+        `symbols` na diye ho toh registry ke saare symbols.
         """
-        # HACKATHON FIX: MATIC aur UNI ko list se hata diya
-        symbols = ['BTC', 'ETH', 'ADA', 'SOL', 'DOT', 'AVAX', 'LINK', 'LTC']
-        
-        for symbol in symbols:
-            model_path = f"models/model_{symbol.lower()}.keras"
-            scaler_path = f"scalers/scaler_{symbol.lower()}.pkl"
-            
+        # Khaali list ka matlab 'koi symbol nahi' hai, 'saare symbols' nahi
+        for symbol in registry.symbols() if symbols is None else symbols:
             # Try to load existing model
-            if os.path.exists(model_path) and os.path.exists(scaler_path):
+            if self.has_model(symbol):
                 try:
-                    self.models[symbol] = load_model(model_path) # Keras model aise load hota hai
-                    with open(scaler_path, 'rb') as f:
-                        self.scalers[symbol] = pickle.load(f)
-                    logging.info(f"Loaded existing LSTM model and scaler for {symbol}")
+                    self.get_model(symbol)
                     continue
                 except Exception as e:
                     logging.error(f"Error loading model for {symbol}: {e}. Retraining...")
@@ -166,35 +291,37 @@ class CryptoPredictionModel:
             if not success:
                 logging.error(f"Failed to train new LSTM model for {symbol}")
     
-    def predict_price(self, symbol):
+    def predict_price(self, symbol, data=None):
         """
         YEH FUNCTION FIX KIYA GAYA HAI (CRASH FIX)
+        `data` pehle se fetch kiya hua price data ho sakta hai (predict_all ke liye)
         """
-        if symbol not in self.models or symbol not in self.scalers:
-            logging.error(f"No model or scaler available for {symbol}")
-            return None
-            
         try:
-            # 1. Model aur Scaler ko memory se load karo
-            model = self.models[symbol]
-            scaler = self.scalers[symbol]
+            # 1. Model aur Scaler ko memory (ya disk) se load karo
+            artifacts = self.get_model(symbol)
+            if artifacts is None:
+                logging.error(f"No model or scaler available for {symbol}")
+                return None
+            model, scaler, lookback_days = artifacts
             
-            # 2. Naya (Live) Data Fetch Karo (60 din + extra)
-            data = self.get_crypto_data(symbol, period="90d") # 90 din ka data lete hain safe rehne ke liye
-            if data is None or len(data) < self.lookback_days:
+            # 2. Naya (Live) Data Fetch Karo (lookback + extra)
+            if data is None:
+                period = f"{max(90, lookback_days + 30)}d" # Kam se kam 90 din ka data lete hain safe rehne ke liye
+                data = self.get_crypto_data(symbol, period=period)
+            if data is None or len(data) < lookback_days:
                 logging.error(f"Not enough recent data for {symbol}")
                 return None
             
             # 3. Data Ko Prepare Karo (Scaling + Reshaping)
-            # Sirf pichle 60 din ka 'Close' price lo
-            recent_prices = data['Close'].tail(self.lookback_days).values.reshape(-1, 1)
+            # Sirf pichle lookback_days din ka 'Close' price lo
+            recent_prices = data['Close'].tail(lookback_days).values.reshape(-1, 1)
             
             # Is naye data ko *purane* (saved) scaler se 0-1 mein badlo
             scaled_input = scaler.transform(recent_prices)
             
             # Isse 3D shape mein badlo (LSTM ke liye)
-            # (1 sample, 60 days, 1 feature)
-            X_test = np.reshape(scaled_input, (1, self.lookback_days, 1))
+            # (1 sample, lookback days, 1 feature)
+            X_test = np.reshape(scaled_input, (1, lookback_days, 1))
             
             # 4. Prediction Karo
             scaled_prediction = model.predict(X_test)
@@ -223,7 +350,7 @@ class CryptoPredictionModel:
                 'current_price': current_price,
                 'predicted_price': float(predicted_price),
                 'change_percent': float((predicted_price - current_price) / current_price * 100),
-                'prediction_date': (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+                'prediction_date': (datetime.utcnow() + timedelta(days=1)).strftime('%Y-%m-%d')
             }
         
         except Exception as e:
@@ -231,6 +358,53 @@ class CryptoPredictionModel:
             logging.error(f"Error predicting price for {symbol}: {e}", exc_info=True)
             return None
 
+    def predict_all(self, symbols=None):
+        """
+        Saare symbols ki prediction batch mein.
+        Yahoo Finance se data DOWNLOAD_BATCH_SIZE tickers ke chunks mein aata hai,
+        phir har model chalta hai (models LRU cache se load/evict hote hain).
+        """
+        symbols = [s for s in (registry.symbols() if symbols is None else symbols) if self.has_model(s)]
+        if not symbols:
+            return {}
+        
+        # Period sirf andaaza hai (manifest + memory wale models); asli lookback model load
+        # hone par pata chalta hai, isliye data kam pade toh neeche live fetch hota hai
+        manifest = load_manifest()
+        max_lookback = max(get_model_config(s, manifest)['lookback_days'] for s in symbols)
+        with self._models_lock:
+            max_lookback = max([max_lookback] + list(self.lookbacks.values()))
+        period = f"{max(90, max_lookback + 30)}d"
+        
+        predictions = {}
+        for i in range(0, len(symbols), DOWNLOAD_BATCH_SIZE):
+            batch = symbols[i:i + DOWNLOAD_BATCH_SIZE]
+            tickers = [registry.ticker(s) for s in batch]
+            try:
+                data = yf.download(tickers, period=period, interval="1d",
+                                   auto_adjust=True, group_by='ticker')
+            except Exception as e:
+                logging.error(f"Error fetching batch data for {batch}: {e}")
+                continue
+            
+            for symbol, ticker in zip(batch, tickers):
+                if data is None or ticker not in data.columns.get_level_values(0):
+                    logging.error(f"No data found for {ticker} in batch download")
+                    continue
+                symbol_data = data[ticker].dropna(subset=['Close'])
+                
+                artifacts = self.get_model(symbol)
+                if artifacts is not None and len(symbol_data) < artifacts[2]:
+                    # Model ka lookback manifest se lamba hai (retrain pending); symbol ka data alag se lo
+                    logging.warning(f"Batch data for {symbol} has {len(symbol_data)} rows, model needs "
+                                    f"{artifacts[2]}; fetching it separately")
+                    symbol_data = None
+                result = self.predict_price(symbol, data=symbol_data)
+                if result:
+                    predictions[symbol] = result
+        
+        return predictions
+
     def get_historical_data(self, symbol, days=30):
         """(Yeh function bhi warning ke liye fix kiya gaya hai)"""
         try:
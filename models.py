@@ -1,9 +1,16 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+import logging
+import symbols
 
 class Prediction(db.Model):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        # Ek crypto ki ek date ke liye sirf ek prediction (upsert isi par hota hai)
+        Index('ix_predictions_crypto_prediction_date', 'crypto', 'prediction_date', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     crypto = Column(String(10), nullable=False)
@@ -11,6 +18,7 @@ class Prediction(db.Model):
     predicted_price = Column(Float, nullable=False)
     actual_price = Column(Float, nullable=True)
     prediction_date = Column(String(20), nullable=False)  # Date for which prediction was made
+    current_price = Column(Float, nullable=True)  # Price jab prediction banayi gayi thi
     
     def __repr__(self):
         return f'<Prediction {self.crypto}: ${self.predicted_price} for {self.prediction_date}>'
@@ -24,6 +32,108 @@ class Prediction(db.Model):
             'actual_price': round(self.actual_price, 2) if self.actual_price is not None else None,
             'prediction_date': self.prediction_date
         }
+    
+    @classmethod
+    def upsert(cls, rows):
+        """
+        Insert predictions, ya (crypto, prediction_date) pehle se ho toh update.
+        `rows` dicts ki list hai; commit caller karta hai.
+        """
+        if not rows:
+            return
+        
+        dialect = db.engine.dialect.name
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(cls).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['crypto', 'prediction_date'],
+            set_={
+                'predicted_price': stmt.excluded.predicted_price,
+                'current_price': stmt.excluded.current_price,
+                'date': stmt.excluded.date
+            }
+        )
+        db.session.execute(stmt)
+
+def upgrade_predictions_table():
+    """
+    Purane predictions table mein current_price column aur unique index jodta hai.
+    db.create_all() existing tables ko alter nahi karta, isliye yeh startup par chalta hai.
+    """
+    inspector = inspect(db.engine)
+    columns = {c['name'] for c in inspector.get_columns('predictions')}
+    indexes = {i['name'] for i in inspector.get_indexes('predictions')}
+    
+    with db.engine.begin() as conn:
+        if 'current_price' not in columns:
+            conn.execute(text("ALTER TABLE predictions ADD COLUMN current_price FLOAT"))
+            logging.info("Added current_price column to predictions table")
+        
+        for index in Prediction.__table__.indexes:
+            if index.name in indexes:
+                continue
+            # Unique index se pehle duplicate (crypto, prediction_date) hatao, sabse nayi row rakho
+            result = conn.execute(text(
+                "DELETE FROM predictions WHERE id NOT IN "
+                "(SELECT MAX(id) FROM predictions GROUP BY crypto, prediction_date)"
+            ))
+            if result.rowcount:
+                logging.info(f"Removed {result.rowcount} duplicate predictions before adding unique index")
+            index.create(conn)
+            logging.info(f"Added index {index.name} to predictions table")
+
+
+class CryptoSymbol(db.Model):
+    __tablename__ = 'crypto_symbols'
+    
+    symbol = Column(String(10), primary_key=True)
+    name = Column(String(50), nullable=False)
+    ticker = Column(String(20), nullable=False)  # Yahoo Finance ticker
+    icon = Column(String(10), nullable=True)
+    tier = Column(Integer, nullable=False, default=1)  # 1 = sabse zaroori, roz predict/train
+    enabled = Column(Boolean, nullable=False, default=True)
+    
+    def __repr__(self):
+        return f'<CryptoSymbol {self.symbol} (tier {self.tier})>'
+    
+    def to_dict(self):
+        return {
+            'symbol': self.symbol,
+            'name': self.name,
+            'ticker': self.ticker,
+            'icon': self.icon or '',
+            'tier': self.tier,
+            'enabled': self.enabled
+        }
+
+def sync_symbols():
+    """
+    symbols.json hi source of truth hai: har startup par uske saare fields
+    crypto_symbols table mein likho (naye insert, purane update), aur jo
+    symbols config mein nahi hain unhe disable karo. Phir registry reload karo,
+    taaki web app aur scripts (jo seedha symbols.json padhte hain) ek hi list dekhein.
+    """
+    config = [symbols.normalize_entry(e) for e in symbols.load_config()]
+    if not config:
+        # Config padh hi nahi paaye; table ko chhedo mat, jo hai wahi use karo
+        logging.error("Symbol config is empty or unreadable, keeping crypto_symbols as is")
+    else:
+        existing = {s.symbol: s for s in CryptoSymbol.query.all()}
+        for entry in config:
+            row = existing.pop(entry['symbol'], None)
+            if row is None:
+                db.session.add(CryptoSymbol(**entry))
+            else:
+                for field, value in entry.items():
+                    setattr(row, field, value)
+        for row in existing.values():
+            row.enabled = False
+        db.session.commit()
+    
+    # symbols.json wala order rakho (dropdown isi order mein dikhta hai)
+    order = {e['symbol']: i for i, e in enumerate(config)}
+    rows = sorted(CryptoSymbol.query.all(), key=lambda s: (order.get(s.symbol, len(order)), s.symbol))
+    symbols.registry.load(s.to_dict() for s in rows)
 
 class PortfolioHolding(db.Model):
     __tablename__ = 'portfolio_holdings'
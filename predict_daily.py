@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Daily prediction job
+Daily close ke baad saare supported symbols ki next-day prediction ek batch
+mein banata hai aur predictions table mein upsert karta hai, taaki
+/api/predict sirf DB se padh sake.
+
+Cron entries (crypto daily close 00:00 UTC hota hai), tier ke hisaab se:
+  10 0 * * * cd /path/to/app && python predict_daily.py --tier 1 >> logs/predict_daily.log 2>&1
+  30 0 * * * cd /path/to/app && python predict_daily.py --tier 2 >> logs/predict_daily.log 2>&1
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+def run_daily_predictions(symbols=None, tier=None):
+    """Saare (ya diye gaye / ek tier ke) symbols ki prediction banao aur DB mein upsert karo"""
+    from app import app, db
+    from models import Prediction
+    from symbols import registry
+
+    with app.app_context():
+        if symbols is None and tier is not None:
+            symbols = registry.symbols(tier)
+        predictions = app.ml_model.predict_all(symbols)
+        now = datetime.utcnow()
+        rows = [{
+            'crypto': symbol,
+            'predicted_price': result['predicted_price'],
+            'current_price': result['current_price'],
+            'prediction_date': result['prediction_date'],
+            'date': now
+        } for symbol, result in predictions.items()]
+
+        Prediction.upsert(rows)
+        db.session.commit()
+
+    logging.info(f"Stored {len(rows)} daily predictions: {', '.join(sorted(predictions))}")
+    return predictions
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute next-day predictions for all symbols")
+    parser.add_argument('--symbols', nargs='+', help='Sirf yeh symbols (default: registry ke saare symbols)')
+    parser.add_argument('--tier', type=int, help='Sirf is tier ke symbols (symbols.json)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    symbols = [s.upper() for s in args.symbols] if args.symbols else None
+    predictions = run_daily_predictions(symbols, args.tier)
+
+    for symbol, result in sorted(predictions.items()):
+        print(f"{symbol}: ${result['current_price']:.2f} -> ${result['predicted_price']:.2f} on {result['prediction_date']}")
+
+if __name__ == "__main__":
+    main()
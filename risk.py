@@ -0,0 +1,188 @@
+"""
+Portfolio risk analytics
+Saare symbols ke aligned daily returns ek matrix (days x symbols) mein rakhkar
+VaR/CVaR, volatility, drawdown aur correlation NumPy mein ek saath nikaalta hai.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from symbols import registry
+
+TRADING_DAYS_PER_YEAR = 365 # Crypto market har din khula rehta hai
+
+MAX_HISTORY_DAYS = 1825 # /api/portfolio/risk ki sabse lambi window; har symbol itna ek baar download hota hai
+MAX_CACHED_SYMBOLS = int(os.environ.get('MAX_CACHED_PRICE_SYMBOLS', 256))
+FAILED_SYMBOL_TTL = timedelta(minutes=15) # Bina data wale symbols itni der dobara download nahi hote
+MIN_HISTORY_COVERAGE = 0.9 # Window ke kam se kam itne din ka data ho, warna symbol missing maana jaata hai
+
+# {symbol: close prices (pd.Series)} sirf aaj ke UTC din ke liye, LRU order mein
+_price_cache = OrderedDict()
+_price_cache_day = None
+# {symbol: kab fail hua}; delisted symbol har request par poora download dobara na karwaye
+_failed_symbols = {}
+_cache_lock = threading.Lock()
+
+def _download_closes(symbols):
+    """
+    Symbols ki poori (MAX_HISTORY_DAYS) daily close history ek download mein.
+    {symbol: pd.Series}; jin symbols ka data nahi mila woh dict mein nahi hote.
+    Download hi fail ho toh exception raise hota hai.
+    """
+    tickers = [registry.ticker(s) for s in symbols]
+    data = yf.download(tickers, period=f"{MAX_HISTORY_DAYS}d", interval="1d", auto_adjust=True, group_by='column')
+    if data is None or data.empty:
+        return {}
+
+    close = data['Close'].reindex(columns=tickers)
+    closes = {}
+    for symbol, ticker in zip(symbols, tickers):
+        series = close[ticker].dropna()
+        if not series.empty:
+            closes[symbol] = series
+    return closes
+
+def _cached_closes(symbols):
+    """
+    Har symbol ki close history cache se, baaki ek saath download karke.
+    Jin symbols ka data nahi mila (ya abhi FAILED_SYMBOL_TTL ke andar fail hue) woh result mein nahi hote.
+    """
+    global _price_cache_day
+    now = datetime.utcnow()
+    trading_day = now.strftime('%Y-%m-%d')
+
+    with _cache_lock:
+        if trading_day != _price_cache_day:
+            _price_cache.clear()
+            _failed_symbols.clear()
+            _price_cache_day = trading_day
+
+        closes = {}
+        for s in symbols:
+            if s in _price_cache:
+                _price_cache.move_to_end(s)
+                closes[s] = _price_cache[s]
+        pending = [s for s in symbols
+                   if s not in closes and now - _failed_symbols.get(s, datetime.min) > FAILED_SYMBOL_TTL]
+
+    if pending:
+        downloaded = _download_closes(pending)
+        failed = [s for s in pending if s not in downloaded]
+        if failed:
+            logging.warning(f"No price history for {failed}, retrying after {FAILED_SYMBOL_TTL}")
+
+        with _cache_lock:
+            for s in failed:
+                _failed_symbols[s] = now
+            for s, series in downloaded.items():
+                _price_cache[s] = series
+                _price_cache.move_to_end(s)
+            while len(_price_cache) > MAX_CACHED_SYMBOLS:
+                _price_cache.popitem(last=False)
+        closes.update(downloaded)
+
+    return closes
+
+def get_price_matrix(symbols, days):
+    """
+    (symbols, aligned close prices (days x symbols), (start_date, end_date)) pichle `days` din ke liye.
+    History har symbol ke liye ek baar (MAX_HISTORY_DAYS) download hoti hai aur UTC din
+    bhar cache rehti hai; har window usi se slice hoti hai. Jin symbols ka data nahi
+    mila, ya jinki history window ke MIN_HISTORY_COVERAGE se chhoti hai (naye listed coins),
+    woh result mein nahi hote, taaki ek naya coin poori window chhoti na kar de.
+    Download fail ho toh None.
+    """
+    try:
+        closes = _cached_closes(list(symbols))
+    except Exception as e:
+        logging.error(f"Error fetching price matrix for {symbols}: {e}")
+        return None
+
+    found = [s for s in symbols if s in closes]
+    if not found:
+        return (), np.empty((0, 0)), None
+
+    close = pd.concat([closes[s] for s in found], axis=1, keys=found)
+    close = close[close.index > close.index[-1] - pd.Timedelta(days=days)]
+
+    coverage = close.notna().mean()
+    short = list(coverage.index[coverage < MIN_HISTORY_COVERAGE])
+    if short:
+        logging.warning(f"Price history for {short} covers less than {MIN_HISTORY_COVERAGE:.0%} of {days} days, leaving out")
+        close = close.drop(columns=short)
+    # Gaps ko pichle price se bharo, phir jahan kisi symbol ka data shuru hi nahi hua woh din hatao
+    close = close.ffill().dropna()
+    if close.empty or len(close) < 2:
+        return (), np.empty((0, 0)), None
+
+    window = (close.index[0].strftime('%Y-%m-%d'), close.index[-1].strftime('%Y-%m-%d'))
+    return tuple(close.columns), close.to_numpy(dtype=np.float64), window
+
+def compute_risk(prices, amounts, confidence=0.95):
+    """
+    `prices`: (days x symbols) close prices, `amounts`: har symbol ki total quantity.
+    Portfolio current weights ke saath poori history par evaluate hota hai.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    returns = prices[1:] / prices[:-1] - 1.0 # (days-1 x symbols)
+
+    values = amounts * prices[-1]
+    total_value = float(values.sum())
+    weights = values / total_value
+
+    # Har din ka portfolio return ek matrix-vector product mein
+    portfolio_returns = returns @ weights
+    alpha = 1.0 - confidence
+
+    # Historical: actual return distribution ka left tail
+    cutoff = np.quantile(portfolio_returns, alpha)
+    tail = portfolio_returns[portfolio_returns <= cutoff]
+    historical_var = -cutoff * total_value
+    historical_cvar = -tail.mean() * total_value
+
+    # Parametric: normal distribution, sigma = sqrt(w' * Cov * w)
+    covariance = np.atleast_2d(np.cov(returns, rowvar=False))
+    mu = float(returns.mean(axis=0) @ weights)
+    sigma = float(np.sqrt(weights @ covariance @ weights))
+    normal = NormalDist()
+    z = normal.inv_cdf(alpha)
+    parametric_var = -(mu + z * sigma) * total_value
+    parametric_cvar = -(mu - sigma * normal.pdf(z) / alpha) * total_value
+
+    # Volatility (annualized)
+    asset_vol = np.sqrt(np.diag(covariance) * TRADING_DAYS_PER_YEAR)
+    portfolio_vol = sigma * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    # Drawdown: portfolio value path ka apne peak se girna
+    growth = np.cumprod(1.0 + portfolio_returns)
+    peaks = np.maximum.accumulate(growth)
+    drawdowns = growth / peaks - 1.0
+
+    # Correlation: covariance ko std se normalize karo
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.outer(std, std)
+    correlation = np.nan_to_num(correlation)
+
+    return {
+        'total_value': total_value,
+        'weights': weights,
+        'historical_var': float(historical_var),
+        'historical_cvar': float(historical_cvar),
+        'parametric_var': float(parametric_var),
+        'parametric_cvar': float(parametric_cvar),
+        'portfolio_volatility': float(portfolio_vol),
+        'asset_volatility': asset_vol,
+        'max_drawdown': float(drawdowns.min()),
+        'current_drawdown': float(drawdowns[-1]),
+        'correlation': correlation,
+        'observations': len(portfolio_returns)
+    }
@@ -1,9 +1,15 @@
-from flask import render_template, request, jsonify
+from flask import render_template, request, jsonify, Response, stream_with_context
 from app import app, db
 from models import Prediction, PortfolioHolding # PortfolioHolding ko import kar rahe hain
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import insert, func
+import csv
+import io
 import logging
+import math
 import yfinance as yf
+import risk
+from symbols import registry
 
 # ------ STEP 2.3 (NAYA CODE) START ------
 from bytez import Bytez # Nayi 'bytez' library ko import kiya
@@ -88,7 +94,14 @@ def analyze_prediction():
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template('index.html')
+    return render_template('index.html', symbols=registry.entries())
+
+@app.route('/api/symbols')
+def list_symbols():
+    """Supported cryptocurrencies, optionally filtered by tier"""
+    tier = request.args.get('tier', type=int)
+    entries = [e for e in registry.entries() if tier is None or e['tier'] == tier]
+    return jsonify({'success': True, 'symbols': entries})
 
 @app.route('/api/predict', methods=['POST'])
 def predict():
@@ -97,27 +110,42 @@ def predict():
         data = request.get_json()
         crypto = data.get('crypto', '').upper()
         
-        # HACKATHON FIX: List se MATIC aur UNI hata diye
-        valid_cryptos = ['BTC', 'ETH', 'ADA', 'SOL', 'DOT', 'AVAX', 'LINK', 'LTC']
-        if crypto not in valid_cryptos:
+        if crypto not in registry:
             return jsonify({'error': f'Invalid cryptocurrency.'}), 400
         
-        # Generate prediction using ML model (Naya LSTM model)
+        # Pehle daily job ki precomputed prediction dhoondo (indexed lookup). Date UTC mein, daily close 00:00 UTC hai
+        prediction_date = (datetime.utcnow() + timedelta(days=1)).strftime('%Y-%m-%d')
+        prediction = Prediction.query.filter_by(crypto=crypto, prediction_date=prediction_date).first()
+        
+        if prediction is not None and prediction.current_price:
+            change_percent = (prediction.predicted_price - prediction.current_price) / prediction.current_price * 100
+            return jsonify({
+                'success': True,
+                'crypto': crypto,
+                'current_price': prediction.current_price,
+                'predicted_price': prediction.predicted_price,
+                'change_percent': change_percent,
+                'prediction_date': prediction.prediction_date,
+                'prediction_id': prediction.id,
+                'precomputed': True
+            })
+        
+        # Fallback: Generate prediction using ML model (Naya LSTM model)
         prediction_result = app.ml_model.predict_price(crypto)
         
         if not prediction_result:
             return jsonify({'error': f'Failed to generate prediction for {crypto}. Please try again.'}), 500
         
-        # Save prediction to database
-        prediction = Prediction(
-            crypto=crypto,
-            predicted_price=prediction_result['predicted_price'],
-            actual_price=None, # Actual price abhi 'None' hai
-            prediction_date=datetime.strptime(prediction_result['prediction_date'], '%Y-%m-%d').date()
-        )
-        
-        db.session.add(prediction)
+        # Save prediction to database (same date ki purani row update ho jaati hai)
+        Prediction.upsert([{
+            'crypto': crypto,
+            'predicted_price': prediction_result['predicted_price'],
+            'current_price': prediction_result['current_price'],
+            'prediction_date': prediction_result['prediction_date'],
+            'date': datetime.utcnow()
+        }])
         db.session.commit()
+        prediction = Prediction.query.filter_by(crypto=crypto, prediction_date=prediction_result['prediction_date']).first()
         
         # Return prediction with additional info
         response_data = {
@@ -127,7 +155,8 @@ def predict():
             'predicted_price': prediction_result['predicted_price'],
             'change_percent': prediction_result['change_percent'],
             'prediction_date': prediction_result['prediction_date'],
-            'prediction_id': prediction.id
+            'prediction_id': prediction.id,
+            'precomputed': False
         }
         
         logging.info(f"Generated prediction for {crypto}: ${prediction_result['predicted_price']:.2f}")
@@ -169,9 +198,7 @@ def chart_data():
         crypto = request.args.get('crypto', 'BTC').upper()
         days = request.args.get('days', 30, type=int)
         
-        # HACKATHON FIX: List se MATIC aur UNI hata diye
-        valid_cryptos = ['BTC', 'ETH', 'ADA', 'SOL', 'DOT', 'AVAX', 'LINK', 'LTC']
-        if crypto not in valid_cryptos:
+        if crypto not in registry:
             return jsonify({'error': 'Invalid cryptocurrency'}), 400
         
         # Get historical data
@@ -201,6 +228,24 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error occurred.'}), 500
 
 # Portfolio Management Endpoints (Yeh code change nahi hua hai)
+def _get_current_prices(cryptos):
+    """Latest close price for every symbol in `cryptos` (0 if unavailable)"""
+    # Filter out any 'bad' cryptos just in case
+    cryptos = [c for c in cryptos if c in registry]
+    
+    current_prices = {}
+    
+    for crypto in cryptos:
+        try:
+            ticker = yf.Ticker(registry.ticker(crypto))
+            data = ticker.history(period="1d")
+            if not data.empty:
+                current_prices[crypto] = float(data['Close'].iloc[-1])
+        except:
+            current_prices[crypto] = 0
+    
+    return current_prices
+
 @app.route('/api/portfolio', methods=['GET'])
 def get_portfolio():
     """Get all portfolio holdings with current values"""
@@ -216,21 +261,7 @@ def get_portfolio():
             })
         
         # Get current prices for all unique cryptos in portfolio
-        cryptos = list(set([h.crypto for h in holdings]))
-        # HACKATHON FIX: Filter out any 'bad' cryptos just in case
-        valid_cryptos = ['BTC', 'ETH', 'ADA', 'SOL', 'DOT', 'AVAX', 'LINK', 'LTC']
-        cryptos = [c for c in cryptos if c in valid_cryptos]
-        
-        current_prices = {}
-        
-        for crypto in cryptos:
-            try:
-                ticker = yf.Ticker(f"{crypto}-USD")
-                data = ticker.history(period="1d")
-                if not data.empty:
-                    current_prices[crypto] = float(data['Close'].iloc[-1])
-            except:
-                current_prices[crypto] = 0
+        current_prices = _get_current_prices(set(h.crypto for h in holdings))
         
         # Calculate portfolio metrics
         holdings_data = []
@@ -283,10 +314,12 @@ def add_holding():
         purchase_price = float(data.get('purchase_price', 0))
         notes = data.get('notes', '')
         
-        valid_cryptos = ['BTC', 'ETH', 'ADA', 'SOL', 'DOT', 'AVAX', 'LINK', 'LTC']
-        if crypto not in valid_cryptos:
+        if crypto not in registry:
             return jsonify({'error': 'Invalid cryptocurrency.'}), 400
         
+        if not (math.isfinite(amount) and math.isfinite(purchase_price)):
+            return jsonify({'error': 'Invalid amount or price format.'}), 400
+        
         if amount <= 0 or purchase_price <= 0:
             return jsonify({'error': 'Amount and purchase price must be greater than 0.'}), 400
         
@@ -314,6 +347,81 @@ def add_holding():
         logging.error(f"Error adding holding: {e}", exc_info=True)
         return jsonify({'error': 'Failed to add holding to portfolio'}), 500
 
+@app.route('/api/portfolio/risk', methods=['GET'])
+def portfolio_risk():
+    """VaR/CVaR, volatility, drawdown and correlation matrix for the portfolio"""
+    try:
+        days = request.args.get('days', 365, type=int)
+        confidence = request.args.get('confidence', 0.95, type=float)
+        
+        if not 30 <= days <= 1825:
+            return jsonify({'error': 'days must be between 30 and 1825.'}), 400
+        if not 0.5 <= confidence < 1:
+            return jsonify({'error': 'confidence must be between 0.5 and 1.'}), 400
+        
+        # Saare lots ko DB mein hi symbol ke hisaab se jodo
+        positions = dict(db.session.execute(
+            db.select(PortfolioHolding.crypto, func.sum(PortfolioHolding.amount))
+            .group_by(PortfolioHolding.crypto)
+        ).all())
+        positions = {c: a for c, a in positions.items() if a and a > 0}
+        
+        if not positions:
+            return jsonify({'error': 'Portfolio is empty.'}), 400
+        
+        supported = sorted(c for c in positions if c in registry)
+        price_matrix = risk.get_price_matrix(supported, days)
+        if price_matrix is None:
+            return jsonify({'error': 'Failed to get price history for portfolio.'}), 500
+        
+        symbols, prices, window = price_matrix
+        # Jin holdings ka price history nahi mila (ya symbol supported nahi) woh risk mein shaamil nahi hain
+        missing_symbols = sorted(set(positions) - set(symbols))
+        if not symbols:
+            return jsonify({
+                'error': 'No price history available for any holding in the portfolio.',
+                'missing_symbols': missing_symbols
+            }), 400
+        if missing_symbols:
+            logging.warning(f"Portfolio risk computed without {missing_symbols}")
+        result = risk.compute_risk(prices, [positions[s] for s in symbols], confidence)
+        
+        return jsonify({
+            'success': True,
+            'days': days,
+            'confidence': confidence,
+            'observations': result['observations'],
+            'start_date': window[0],
+            'end_date': window[1],
+            'missing_symbols': missing_symbols,
+            'total_value': round(result['total_value'], 2),
+            'var': {
+                'historical': round(result['historical_var'], 2),
+                'parametric': round(result['parametric_var'], 2)
+            },
+            'cvar': {
+                'historical': round(result['historical_cvar'], 2),
+                'parametric': round(result['parametric_cvar'], 2)
+            },
+            'volatility': {
+                'portfolio': round(result['portfolio_volatility'], 4),
+                'assets': {s: round(float(v), 4) for s, v in zip(symbols, result['asset_volatility'])}
+            },
+            'weights': {s: round(float(w), 4) for s, w in zip(symbols, result['weights'])},
+            'drawdown': {
+                'max': round(result['max_drawdown'], 4),
+                'current': round(result['current_drawdown'], 4)
+            },
+            'correlation': {
+                'symbols': list(symbols),
+                'matrix': result['correlation'].round(4).tolist()
+            }
+        })
+        
+    except Exception as e:
+        logging.error(f"Error computing portfolio risk: {e}", exc_info=True)
+        return jsonify({'error': 'Failed to compute portfolio risk'}), 500
+
 @app.route('/api/portfolio/<int:holding_id>', methods=['DELETE'])
 def delete_holding(holding_id):
     """Delete a portfolio holding"""
@@ -332,4 +440,198 @@ def delete_holding(holding_id):
         
     except Exception as e:
         logging.error(f"Error deleting holding: {e}", exc_info=True)
-        return jsonify({'error': 'Failed to remove holding from portfolio'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to remove holding from portfolio'}), 500
+
+
+# Bulk Import / Export
+MAX_IMPORT_ROWS = 200000
+MAX_IMPORT_ERRORS = 50 # Response mein itne hi errors bhejenge
+HOLDING_COLUMNS = ['crypto', 'amount', 'purchase_price', 'purchase_date', 'notes']
+
+def _read_import_rows():
+    """
+    Request se raw rows nikalta hai. Teen format chalte hain:
+    - multipart upload (field 'file') -> CSV
+    - text/csv body
+    - JSON body: list of lots ya {"holdings": [...]}
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        text = io.TextIOWrapper(upload.stream, encoding='utf-8-sig')
+        return list(csv.DictReader(text))
+    
+    if request.mimetype == 'text/csv':
+        text = request.get_data(as_text=True)
+        return list(csv.DictReader(io.StringIO(text)))
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('holdings')
+    if not isinstance(data, list):
+        raise ValueError('Expected a CSV file or a JSON list of holdings.')
+    return data
+
+def _parse_import_number(value, field):
+    """Import row ka number field: finite aur > 0 hona chahiye"""
+    # JSON true/false bhi float() se 1.0/0.0 ban jaate hain, unhe alag se roko
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f'{field} must be a number')
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f'{field} must be a number, got {value!r}')
+    # float() 'inf' aur 'nan' bhi accept karta hai, unhe yahin rok do
+    if not math.isfinite(number):
+        raise ValueError(f'{field} must be a finite number')
+    if number <= 0:
+        raise ValueError(f'{field} must be greater than 0')
+    return number
+
+def _parse_import_date(value, default):
+    """purchase_date 'YYYY-MM-DD' string honi chahiye (khaali ho toh `default`)"""
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        raise ValueError('purchase_date must be a YYYY-MM-DD string')
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f'purchase_date must be YYYY-MM-DD, got {value!r}')
+
+def _validate_import_rows(raw_rows):
+    """Har row ko check karo; valid rows aur errors dono return karta hai"""
+    now = datetime.utcnow()
+    rows, errors = [], []
+    
+    # Line 1 CSV header hai, isliye data line 2 se shuru hoti hai
+    for line, raw in enumerate(raw_rows, start=2):
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError('row must be an object')
+            crypto = str(raw.get('crypto') or '').strip().upper()
+            if crypto not in registry:
+                raise ValueError(f'invalid cryptocurrency {crypto!r}')
+            amount = _parse_import_number(raw.get('amount'), 'amount')
+            purchase_price = _parse_import_number(raw.get('purchase_price'), 'purchase_price')
+            purchase_date = _parse_import_date(raw.get('purchase_date'), now)
+            # Khaali notes NULL rakho; PostgreSQL COPY bhi khaali CSV field ko NULL likhta hai
+            notes = raw.get('notes')
+            notes = str(notes).strip()[:200] if notes is not None else ''
+            notes = notes or None
+        except ValueError as e:
+            errors.append({'line': line, 'error': str(e)})
+            if len(errors) >= MAX_IMPORT_ERRORS:
+                break
+            continue
+        
+        rows.append({
+            'crypto': crypto,
+            'amount': amount,
+            'purchase_price': purchase_price,
+            'purchase_date': purchase_date,
+            'notes': notes,
+            'created_at': now,
+            'updated_at': now
+        })
+    
+    return rows, errors
+
+def _bulk_insert_holdings(rows):
+    """
+    Saari rows ek hi transaction mein likhta hai.
+    PostgreSQL par COPY use hota hai, baaki databases par ek executemany INSERT.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        columns = list(rows[0].keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[c] for c in columns])
+        buffer.seek(0)
+        
+        # Session wala connection hi use karo taaki commit/rollback ek saath ho
+        raw_conn = db.session.connection().connection
+        with raw_conn.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {PortfolioHolding.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+    else:
+        db.session.execute(insert(PortfolioHolding), rows)
+
+@app.route('/api/portfolio/import', methods=['POST'])
+def import_holdings():
+    """Bulk import portfolio lots from CSV or JSON (all-or-nothing)"""
+    try:
+        raw_rows = _read_import_rows()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': f'Could not read import data: {e}'}), 400
+    
+    if not raw_rows:
+        return jsonify({'error': 'No holdings found in import data.'}), 400
+    if len(raw_rows) > MAX_IMPORT_ROWS:
+        return jsonify({'error': f'Too many rows. Maximum is {MAX_IMPORT_ROWS}.'}), 400
+    
+    rows, errors = _validate_import_rows(raw_rows)
+    if errors:
+        # Ek bhi galat row ho toh kuch bhi insert nahi karte
+        return jsonify({'error': 'Invalid rows in import data.', 'errors': errors}), 400
+    
+    try:
+        _bulk_insert_holdings(rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error importing holdings: {e}", exc_info=True)
+        return jsonify({'error': 'Failed to import holdings'}), 500
+    
+    logging.info(f"Imported {len(rows)} portfolio holdings")
+    return jsonify({
+        'success': True,
+        'message': f'Imported {len(rows)} holdings into your portfolio',
+        'imported': len(rows)
+    })
+
+@app.route('/api/portfolio/export', methods=['GET'])
+def export_holdings():
+    """Stream all holdings with current P&L as CSV"""
+    batch_size = 1000
+    
+    # Prices sirf distinct symbols ke liye chahiye, holdings abhi load nahi karte
+    cryptos = db.session.execute(db.select(PortfolioHolding.crypto).distinct()).scalars().all()
+    current_prices = _get_current_prices(cryptos)
+    
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['id'] + HOLDING_COLUMNS + ['current_price', 'current_value', 'invested_value', 'pnl', 'pnl_percent'])
+        
+        # yield_per se rows DB cursor se batch mein aati hain, poori table memory mein nahi aati
+        query = db.select(PortfolioHolding).order_by(PortfolioHolding.id).execution_options(yield_per=batch_size)
+        for i, holding in enumerate(db.session.execute(query).scalars(), start=1):
+            current_price = current_prices.get(holding.crypto, 0)
+            current_value = (holding.amount or 0) * current_price
+            invested_value = (holding.amount or 0) * (holding.purchase_price or 0)
+            pnl = current_value - invested_value
+            pnl_percent = (pnl / invested_value * 100) if invested_value > 0 else 0
+            
+            writer.writerow([
+                holding.id, holding.crypto, holding.amount, holding.purchase_price,
+                holding.purchase_date.strftime('%Y-%m-%d'), holding.notes or '',
+                round(current_price, 2), round(current_value, 2), round(invested_value, 2),
+                round(pnl, 2), round(pnl_percent, 2)
+            ])
+            
+            if i % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        
+        yield buffer.getvalue()
+    
+    filename = f"portfolio_{datetime.utcnow().strftime('%Y%m%d')}.csv"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
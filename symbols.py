@@ -0,0 +1,90 @@
+"""
+Symbol registry
+Supported cryptocurrencies ki ek hi list. symbols.json source of truth hai:
+scripts use seedha padhte hain, aur app har start par use crypto_symbols table
+mein sync karke registry wahan se load karta hai. Baaki saara code validation,
+tickers aur tiers ke liye yahin se padhta hai.
+
+Naya symbol enable karna: symbols.json mein entry ka "enabled" true karo
+(ya nayi entry jodo), model train karo (python train_model.py) aur app restart karo.
+"""
+
+import json
+import logging
+import os
+
+SYMBOLS_CONFIG_PATH = os.environ.get('SYMBOLS_CONFIG', 'symbols.json')
+
+def load_config(path=SYMBOLS_CONFIG_PATH):
+    """symbols.json se symbol entries (list of dicts) padho"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['symbols']
+    except (OSError, ValueError, KeyError) as e:
+        logging.error(f"Could not read symbol config {path}: {e}")
+        return []
+
+def normalize_entry(entry):
+    """Entry ke missing fields default se bharo"""
+    symbol = entry['symbol'].strip().upper()
+    return {
+        'symbol': symbol,
+        'name': entry.get('name') or symbol,
+        'ticker': entry.get('ticker') or f"{symbol}-USD",
+        'icon': entry.get('icon') or '',
+        'tier': int(entry.get('tier') or 1),
+        'enabled': bool(entry.get('enabled', True))
+    }
+
+class SymbolRegistry:
+    """Enabled symbols ka in-memory index (lookup O(1) dict se)"""
+
+    def __init__(self, entries=()):
+        self._symbols = {}
+        self._tickers = {}
+        self.load(entries)
+
+    def load(self, entries):
+        """Registry ko naye entries se replace karo (disabled entries skip hoti hain)"""
+        symbols = {}
+        for entry in entries:
+            entry = normalize_entry(entry)
+            if entry['enabled']:
+                symbols[entry['symbol']] = entry
+
+        # Naye dicts ek saath swap karo taaki requests ko aadha-load registry na dikhe
+        self._tickers = {e['ticker']: s for s, e in symbols.items()}
+        self._symbols = symbols
+        logging.info(f"Symbol registry loaded with {len(symbols)} symbols")
+
+    def __contains__(self, symbol):
+        return symbol in self._symbols
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def is_valid(self, symbol):
+        return symbol in self._symbols
+
+    def get(self, symbol):
+        return self._symbols.get(symbol)
+
+    def ticker(self, symbol):
+        """Yahoo Finance ticker (default '<SYMBOL>-USD')"""
+        entry = self._symbols.get(symbol)
+        return entry['ticker'] if entry else f"{symbol}-USD"
+
+    def symbol_for_ticker(self, ticker):
+        return self._tickers.get(ticker, ticker.replace('-USD', ''))
+
+    def symbols(self, tier=None):
+        """Saare enabled symbols, ya sirf ek tier ke"""
+        if tier is None:
+            return list(self._symbols)
+        return [s for s, e in self._symbols.items() if e['tier'] == tier]
+
+    def entries(self):
+        return list(self._symbols.values())
+
+# Shared registry; app.py sync ke baad ise crypto_symbols table se reload karta hai
+registry = SymbolRegistry(load_config())
@@ -4,18 +4,33 @@ Script to train and save ML models for crypto prediction
 Run this script to initialize or retrain models
 """
 
-from ml_model import CryptoPredictionModel
+from ml_model import CryptoPredictionModel, load_manifest
+from symbols import registry
+import argparse
 import logging
 
 def main():
+    parser = argparse.ArgumentParser(description="Train crypto prediction models")
+    parser.add_argument('--retrain', nargs='*', metavar='SYMBOL',
+                        help='Retrain these symbols (default: all tuned symbols in models/manifest.json)')
+    parser.add_argument('--tier', type=int, help='Only train symbols of this tier (symbols.json)')
+    args = parser.parse_args()
+    
     logging.basicConfig(level=logging.INFO)
     logging.info("Starting model training...")
     
-    # Initialize and train models
+    # Initialize and train models (missing ones only)
     predictor = CryptoPredictionModel()
+    symbols = registry.symbols(args.tier)
+    predictor.load_or_train_models(symbols)
+    
+    # Tuned configs (tune_model.py) ke saath dobara train karo
+    if args.retrain is not None:
+        for symbol in args.retrain or [s for s in sorted(load_manifest()) if s in symbols]:
+            predictor.train_model(symbol.upper())
     
     # Test predictions
-    for symbol in ['BTC', 'ETH']:
+    for symbol in symbols[:2]:
         prediction = predictor.predict_price(symbol)
         if prediction:
             print(f"\n{symbol} Prediction:")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter search for the per-symbol LSTM models
+Random search ya successive halving chalata hai (units, layers, lookback,
+dropout, batch size) aur har symbol ka best config models/manifest.json
+mein likhta hai. CryptoPredictionModel.train_model wahi config use karta hai.
+
+Usage:
+  python tune_model.py --data data/prices.csv --download   # pehli baar dataset banao
+  python tune_model.py --data data/prices.csv --symbols BTC ETH --trials 27 --workers 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from symbols import registry
+
+SEARCH_SPACE = {
+    'units': [32, 50, 64, 96, 128],
+    'layers': [1, 2, 3],
+    'dropout': [0.0, 0.1, 0.2, 0.3],
+    'lookback_days': [30, 45, 60, 90],
+    'batch_size': [16, 32, 64]
+}
+
+VALIDATION_SPLIT = 0.2 # Aakhri 20% din validation ke liye (time order mein)
+
+def download_dataset(path, symbols, period="3y"):
+    """Yahoo Finance se saare symbols ka daily close ek CSV mein save karo"""
+    import yfinance as yf
+
+    tickers = [registry.ticker(s) for s in symbols]
+    data = yf.download(tickers, period=period, interval="1d", auto_adjust=True)['Close']
+    data.columns = [registry.symbol_for_ticker(c) for c in data.columns]
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data.to_csv(path)
+    logging.info(f"Saved {len(data)} days of prices for {len(symbols)} symbols to {path}")
+
+def load_prices(path, symbol):
+    """Local dataset (Date + ek column per symbol) se ek symbol ke close prices"""
+    data = pd.read_csv(path, index_col=0, parse_dates=True)
+    if symbol not in data.columns:
+        return None
+    return data[symbol].dropna().values.astype('float32')
+
+def sample_configs(n, seed=None):
+    """Search space se `n` alag random configs"""
+    rng = random.Random(seed)
+    configs, seen = [], set()
+    max_unique = int(np.prod([len(v) for v in SEARCH_SPACE.values()]))
+
+    while len(configs) < min(n, max_unique):
+        config = {k: rng.choice(v) for k, v in SEARCH_SPACE.items()}
+        key = tuple(sorted(config.items()))
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+def _init_worker(threads):
+    """
+    Har worker process ko `threads` CPU threads tak limit karo,
+    taaki parallel trials ek doosre se CPU ke liye na ladein.
+    """
+    for var in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS'):
+        os.environ[var] = str(threads)
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def run_trial(prices, config, epochs):
+    """Ek config ko `epochs` tak train karke validation loss (scaled MSE) return karo"""
+    # Worker mein hi import karo, _init_worker ke thread limits ke baad
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.callbacks import Callback
+    from ml_model import build_lstm_model, prepare_features
+
+    class EpochTimer(Callback):
+        """Har epoch ka time alag record karo (fixed build/evaluate cost ke bina)"""
+        def on_train_begin(self, logs=None):
+            self.times = []
+        def on_epoch_begin(self, epoch, logs=None):
+            self._start = time.perf_counter()
+        def on_epoch_end(self, epoch, logs=None):
+            self.times.append(time.perf_counter() - self._start)
+
+    start = time.perf_counter()
+    lookback_days = config['lookback_days']
+    split = int(len(prices) * (1 - VALIDATION_SPLIT))
+
+    # Scaler sirf training data par fit karo (validation leak nahi hona chahiye)
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaler.fit(prices[:split].reshape(-1, 1))
+    scaled = scaler.transform(prices.reshape(-1, 1))
+
+    X_train, y_train = prepare_features(scaled[:split], lookback_days)
+    X_val, y_val = prepare_features(scaled[split - lookback_days:], lookback_days)
+    X_train = X_train.reshape(X_train.shape[0], lookback_days, 1)
+    X_val = X_val.reshape(X_val.shape[0], lookback_days, 1)
+
+    model = build_lstm_model(config)
+    timer = EpochTimer()
+    model.fit(X_train, y_train, epochs=epochs, batch_size=config['batch_size'], verbose=0, callbacks=[timer])
+    val_loss = float(model.evaluate(X_val, y_val, verbose=0))
+
+    return {
+        'config': config,
+        'epochs': epochs,
+        'val_loss': val_loss,
+        'wall_time': time.perf_counter() - start,
+        'epoch_times': timer.times
+    }
+
+def estimate_full_cost(trial, max_epochs):
+    """
+    Trial ko max_epochs tak chalane ka estimated time.
+    Fixed cost (build, compile, evaluate) aur pehla epoch (graph tracing) ek hi baar
+    gine jaate hain; sirf steady-state epoch time max_epochs tak extrapolate hota hai.
+    """
+    epoch_times = trial['epoch_times']
+    fixed = trial['wall_time'] - sum(epoch_times)
+    steady = np.mean(epoch_times[1:]) if len(epoch_times) > 1 else epoch_times[0]
+    return fixed + epoch_times[0] + steady * (max_epochs - 1)
+
+def _run_rung(pool, prices, configs, epochs):
+    """Ek rung ke saare trials parallel chalao, results val_loss ke order mein"""
+    futures = [pool.submit(run_trial, prices, config, epochs) for config in configs]
+    results = [f.result() for f in futures]
+    for r in results:
+        logging.info(f"  trial {r['config']} epochs={epochs}: val_loss={r['val_loss']:.6f} ({r['wall_time']:.1f}s)")
+    return sorted(results, key=lambda r: r['val_loss'])
+
+def tune_symbol(pool, prices, args):
+    """
+    Ek symbol ke liye search chalao.
+    halving: sab configs min_epochs tak, phir top 1/eta ko eta guna epochs, ... max_epochs tak
+    random: har config poore max_epochs tak (koi pruning nahi)
+    """
+    configs = sample_configs(args.trials, args.seed)
+    trials = []
+
+    if args.strategy == 'random':
+        results = _run_rung(pool, prices, configs, args.max_epochs)
+        trials.extend(results)
+    else:
+        epochs = args.min_epochs
+        survivors = configs
+        while True:
+            results = _run_rung(pool, prices, survivors, epochs)
+            trials.extend(results)
+            if len(results) == 1 or epochs >= args.max_epochs:
+                break
+            survivors = [r['config'] for r in results[:max(1, len(results) // args.eta)]]
+            epochs = min(epochs * args.eta, args.max_epochs)
+
+    best = results[0]
+
+    # Pruning ke bina kitna time lagta (estimate), har config ke pehle trial se
+    first_rung = {tuple(sorted(t['config'].items())): t for t in reversed(trials)}
+    full_cost = sum(estimate_full_cost(t, args.max_epochs) for t in first_rung.values())
+    actual_cost = sum(t['wall_time'] for t in trials)
+
+    return best, trials, full_cost, actual_cost
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data/prices.csv', help='Local price dataset (CSV)')
+    parser.add_argument('--download', action='store_true', help='Dataset Yahoo Finance se download karo')
+    parser.add_argument('--symbols', nargs='+', default=registry.symbols())
+    parser.add_argument('--strategy', choices=['halving', 'random'], default='halving')
+    parser.add_argument('--trials', type=int, default=27)
+    parser.add_argument('--min-epochs', type=int, default=3)
+    parser.add_argument('--max-epochs', type=int, default=25)
+    parser.add_argument('--eta', type=int, default=3, help='Har rung mein sirf top 1/eta configs aage jaate hain')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument('--threads', type=int, default=1, help='CPU threads per worker')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='Manifest update mat karo')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.download or not os.path.exists(args.data):
+        download_dataset(args.data, args.symbols)
+
+    from ml_model import load_manifest, save_manifest
+    manifest = load_manifest()
+
+    # 'spawn' taaki har worker fresh TensorFlow runtime ke saath shuru ho
+    context = multiprocessing.get_context('spawn')
+    total_start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                             initializer=_init_worker, initargs=(args.threads,)) as pool:
+        for symbol in args.symbols:
+            prices = load_prices(args.data, symbol)
+            if prices is None or len(prices) < 4 * max(SEARCH_SPACE['lookback_days']):
+                logging.error(f"Not enough data for {symbol} in {args.data}, skipping")
+                continue
+
+            logging.info(f"Tuning {symbol} ({args.strategy}, {args.trials} trials, {args.workers} workers)...")
+            symbol_start = time.perf_counter()
+            best, trials, full_cost, actual_cost = tune_symbol(pool, prices, args)
+            elapsed = time.perf_counter() - symbol_start
+
+            print(f"\n{symbol}: best val_loss={best['val_loss']:.6f} config={best['config']} epochs={best['epochs']}")
+            print(f"  {len(trials)} trial runs, mean {actual_cost / len(trials):.1f}s per trial, {elapsed:.1f}s wall")
+            if args.strategy == 'halving':
+                print(f"  Trial compute {actual_cost:.1f}s vs ~{full_cost:.1f}s estimated without pruning "
+                      f"(~{full_cost / actual_cost:.2f}x estimated speedup; measure the real baseline "
+                      f"with --strategy random --seed <same seed>)")
+            else:
+                print(f"  Trial compute {actual_cost:.1f}s (measured, no pruning)")
+
+            manifest[symbol] = dict(best['config'],
+                                    epochs=best['epochs'],
+                                    val_loss=best['val_loss'],
+                                    tuned_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+
+    print(f"\nTotal wall time: {time.perf_counter() - total_start:.1f}s")
+
+    if not args.dry_run:
+        save_manifest(manifest)
+        print("Best configs written to models/manifest.json. Retrain with: python train_model.py --retrain")
+
+if __name__ == "__main__":
+    main()